@@ -15,7 +15,7 @@ from aider.commands import SwitchModel
 from aider.io import InputOutput
 from aider.litellm import litellm  # noqa: F401; properly init litellm on launch
 from aider.repo import GitRepo
-from aider.versioncheck import check_version
+from aider.versioncheck import check_version, check_version_sync
 
 from .dump import dump  # noqa: F401
 
@@ -295,7 +295,7 @@ def main(argv=None, input=None, output=None, force_git_root=None, return_coder=F
         check_version(io.tool_error)
 
     if args.check_update:
-        update_available = check_version(lambda msg: None)
+        update_available = check_version_sync(lambda msg: None)
         return 0 if not update_available else 1
 
     if args.models:
@@ -1,31 +1,136 @@
+import functools
+import json
+import os
+import re
 import sys
-
-import packaging.version
-import requests
+import threading
+import time
+from pathlib import Path
 
 import aider
 
+VERSION_CHECK_FNAME = Path.home() / ".aider.version.check.json"
+VERSION_CHECK_TTL = 60 * 60 * 24  # 24 hours
+
+VERSION_RE = re.compile(r"^(\d+)\.(\d+)\.(\d+)(-dev|\.dev\d*)?(\+\S+)?$")
+
+
+@functools.lru_cache(maxsize=128)
+def parse_version(version):
+    """Parse X.Y.Z with an optional dev marker and local suffix into a sortable tuple.
+
+    This covers every version aider has shipped, without needing packaging's
+    full PEP 440 machinery. Dev versions sort before their release, and the
+    local +suffix is ignored, both as PEP 440 specifies. Raises ValueError
+    on anything else.
+    """
+    match = VERSION_RE.match(version)
+    if not match:
+        raise ValueError(f"Unparsable version: {version}")
+
+    major, minor, patch, dev, _local = match.groups()
+    return (int(major), int(minor), int(patch), 0 if dev else 1)
+
+
+_opener = None
+
+
+def get_opener():
+    """Shared urllib opener, so repeated fetches reuse one handler chain."""
+    global _opener
+    if _opener is None:
+        from urllib.request import build_opener
+
+        _opener = build_opener()
+    return _opener
+
+
+def fetch_latest_version():
+    from urllib.error import URLError
+    from urllib.request import Request
+
+    # the PEP 691 simple endpoint returns just the version list, a tiny
+    # fraction of the full /pypi/<pkg>/json metadata
+    request = Request(
+        "https://pypi.org/simple/aider-chat/",
+        headers={"Accept": "application/vnd.pypi.simple.v1+json"},
+    )
+    try:
+        with get_opener().open(request, timeout=5) as response:
+            data = json.load(response)
+    except URLError as err:
+        raise RuntimeError(f"Unable to fetch latest version from pypi: {err}")
+
+    releases = []
+    for version in data["versions"]:
+        try:
+            parsed = parse_version(version)
+        except ValueError:
+            continue
+        if parsed[-1]:  # skip dev releases
+            releases.append((parsed, version))
+
+    return max(releases)[1]
+
+
+def load_cached_latest_version():
+    try:
+        data = json.loads(VERSION_CHECK_FNAME.read_text())
+        if time.time() - data["fetched_at"] < VERSION_CHECK_TTL:
+            return data["latest"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return
+
+
+def save_cached_latest_version(latest_version):
+    data = dict(latest=latest_version, fetched_at=time.time())
+    try:
+        tmp_fname = VERSION_CHECK_FNAME.with_suffix(".tmp")
+        tmp_fname.write_text(json.dumps(data))
+        os.replace(tmp_fname, VERSION_CHECK_FNAME)
+    except OSError:
+        pass
+
+
+def get_latest_version():
+    latest_version = load_cached_latest_version()
+    if latest_version:
+        return latest_version
+
+    latest_version = fetch_latest_version()
+    save_cached_latest_version(latest_version)
+    return latest_version
+
+
+def print_update_instructions(print_cmd, latest_version):
+    py = sys.executable
+    if "pipx" in py:
+        upgrade_cmd = "pipx upgrade aider-chat"
+    else:
+        upgrade_cmd = f"{py} -m pip install --upgrade aider-chat"
+
+    msg = f"Newer version v{latest_version} is available. To upgrade, run:"  # noqa: E231
+    print_cmd(f"{msg}\n{upgrade_cmd}")
+
 
 def check_version(print_cmd):
+    """Check pypi for a newer version, without blocking on the network."""
+    threading.Thread(target=check_version_sync, args=(print_cmd,), daemon=True).start()
+
+
+def check_version_sync(print_cmd):
     try:
-        response = requests.get("https://pypi.org/pypi/aider-chat/json")
-        data = response.json()
-        latest_version = data["info"]["version"]
+        latest_version = get_latest_version()
         current_version = aider.__version__
 
-        is_update_available = packaging.version.parse(latest_version) > packaging.version.parse(
-            current_version
-        )
+        # equal strings can't be an update, no need to parse them
+        if latest_version == current_version:
+            return False
+
+        is_update_available = parse_version(latest_version) > parse_version(current_version)
 
         if is_update_available:
-            print_cmd(
-                f"Newer version v{latest_version} is available. To upgrade, run:"  # noqa: E231
-            )
-            py = sys.executable
-            if "pipx" in py:
-                print_cmd("pipx upgrade aider-chat")
-            else:
-                print_cmd(f"{py} -m pip install --upgrade aider-chat")
+            print_update_instructions(print_cmd, latest_version)
 
         return is_update_available
     except Exception as err:
@@ -34,4 +139,4 @@ def check_version(print_cmd):
 
 
 if __name__ == "__main__":
-    check_version(print)
+    check_version_sync(print)
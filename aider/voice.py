@@ -1,19 +1,14 @@
+import io
+import math
 import os
-import queue
-import tempfile
+import sys
 import time
 
 import numpy as np
+from prompt_toolkit.shortcuts import prompt
 
 from aider.litellm import litellm
 
-try:
-    import soundfile as sf
-except (OSError, ModuleNotFoundError):
-    sf = None
-
-from prompt_toolkit.shortcuts import prompt
-
 from .dump import dump  # noqa: F401
 
 
@@ -24,26 +19,62 @@ class SoundDeviceError(Exception):
 class Voice:
     max_rms = 0
     min_rms = 1e5
+    sum_sq = 0
+    n_samples = 0
     pct = 0
 
     threshold = 0.15
 
+    # all 11 possible level-meter bars, so get_prompt never builds strings
+    bars = tuple("░" * cnt + "█" * (10 - cnt) for cnt in range(11))
+
     def __init__(self):
-        if sf is None:
-            raise SoundDeviceError
         try:
-            print("Initializing sound device...")
+            # the imports are slow the first time, so announce them; reuse is silent
+            if "sounddevice" not in sys.modules:
+                print("Initializing sound device...")
+
             import sounddevice as sd
+            import soundfile as sf
 
             self.sd = sd
+            self.sf = sf
         except (OSError, ModuleNotFoundError):
             raise SoundDeviceError
 
-    def callback(self, indata, frames, time, status):
+    # np.multiply is bound as a default arg so each block pays a local
+    # variable lookup instead of a global+attribute lookup
+    def callback(self, indata, frames, time, status, multiply=np.multiply):
         """This is called (from a separate thread) for each audio block."""
-        rms = np.sqrt(np.mean(indata**2))
-        self.max_rms = max(self.max_rms, rms)
-        self.min_rms = min(self.min_rms, rms)
+        flat = indata.ravel()
+
+        # square the int16 samples into a reused int32 scratch, then
+        # normalize the sum back to the float -1..1 scale the meter expects
+        scratch = self.sq_scratch
+        if scratch.size != flat.size:
+            scratch = self.sq_scratch = np.empty(flat.size, dtype=np.int32)
+        multiply(flat, flat, out=scratch, dtype=np.int32)
+        self.sum_sq = float(scratch.sum(dtype=np.int64)) / (32768 * 32768)
+        self.n_samples = flat.size
+
+        end = self.n_recorded + frames
+        if end > len(self.audio):
+            # recording outgrew the preallocation; double it (rare, amortized)
+            self.audio = np.concatenate((self.audio, np.empty_like(self.audio)))
+        self.audio[self.n_recorded : end] = indata
+        self.n_recorded = end
+
+    def update_pct(self):
+        if not self.n_samples:
+            # no audio block yet; don't feed a fake rms=0 into min_rms
+            return
+
+        rms = math.sqrt(self.sum_sq / self.n_samples)
+
+        # decay the extremes toward the current level, so the meter keeps
+        # adapting instead of latching onto an early spike or quiet block
+        self.max_rms = max(rms, self.max_rms * 0.995)
+        self.min_rms = min(rms, self.min_rms / 0.995)
 
         rng = self.max_rms - self.min_rms
         if rng > 0.001:
@@ -51,17 +82,17 @@ class Voice:
         else:
             self.pct = 0.5
 
-        self.q.put(indata.copy())
-
     def get_prompt(self):
-        num = 10
-        if np.isnan(self.pct) or self.pct < self.threshold:
-            cnt = 0
+        self.update_pct()
+
+        pct = self.pct
+        if pct >= self.threshold:
+            cnt = min(int(pct * 10), 10)
         else:
-            cnt = int(self.pct * 10)
+            # also covers pct=NaN, which fails every comparison
+            cnt = 0
 
-        bar = "░" * cnt + "█" * (num - cnt)
-        bar = bar[:num]
+        bar = self.bars[cnt]
 
         dur = time.time() - self.start_time
         return f"Recording, press ENTER when done... {dur:.1f}sec {bar}"
@@ -73,25 +104,32 @@ class Voice:
             return
 
     def raw_record_and_transcribe(self, history, language):
-        self.q = queue.Queue()
-
-        filename = tempfile.mktemp(suffix=".wav")
-
         sample_rate = 16000  # 16kHz
 
+        # preallocate room for a minute of audio; the callback copies each
+        # block straight in, so steady-state recording never allocates
+        self.audio = np.empty((60 * sample_rate, 1), dtype=np.int16)
+        self.n_recorded = 0
+        self.sq_scratch = np.empty(0, dtype=np.int32)
+
         self.start_time = time.time()
 
-        with self.sd.InputStream(samplerate=sample_rate, channels=1, callback=self.callback):
+        with self.sd.InputStream(
+            samplerate=sample_rate, channels=1, dtype="int16", callback=self.callback
+        ):
             prompt(self.get_prompt, refresh_interval=0.1)
 
-        with sf.SoundFile(filename, mode="x", samplerate=sample_rate, channels=1) as file:
-            while not self.q.empty():
-                file.write(self.q.get())
+        audio = self.audio[: self.n_recorded]
+
+        # FLAC is lossless but much smaller than WAV, so the upload is faster
+        audio_file = io.BytesIO()
+        audio_file.name = "audio.flac"
+        self.sf.write(audio_file, audio, sample_rate, format="FLAC")
+        audio_file.seek(0)
 
-        with open(filename, "rb") as fh:
-            transcript = litellm.transcription(
-                model="whisper-1", file=fh, prompt=history, language=language
-            )
+        transcript = litellm.transcription(
+            model="whisper-1", file=audio_file, prompt=history, language=language
+        )
 
         text = transcript.text
         return text
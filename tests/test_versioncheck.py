@@ -0,0 +1,74 @@
+import json
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from aider import versioncheck
+from aider.utils import ChdirTemporaryDirectory
+
+
+class TestVersionCheck(unittest.TestCase):
+    def test_parse_version(self):
+        self.assertLess(versioncheck.parse_version("0.35.0"), versioncheck.parse_version("0.36.0"))
+        self.assertLess(versioncheck.parse_version("0.9.9"), versioncheck.parse_version("0.10.0"))
+
+        # dev versions sort before their release
+        self.assertLess(
+            versioncheck.parse_version("0.36.1-dev"), versioncheck.parse_version("0.36.1")
+        )
+        self.assertLess(
+            versioncheck.parse_version("0.36.1.dev0"), versioncheck.parse_version("0.36.1")
+        )
+
+        # the local +suffix doesn't affect ordering
+        self.assertEqual(
+            versioncheck.parse_version("1.2.3+abc"), versioncheck.parse_version("1.2.3")
+        )
+
+        with self.assertRaises(ValueError):
+            versioncheck.parse_version("not-a-version")
+
+    def test_parse_version_handles_current_version(self):
+        from aider import __version__
+
+        versioncheck.parse_version(__version__)
+
+    def test_get_latest_version_uses_fresh_cache(self):
+        with ChdirTemporaryDirectory():
+            fname = Path("version.check.json")
+            fname.write_text(json.dumps(dict(latest="1.2.3", fetched_at=time.time())))
+
+            with patch("aider.versioncheck.VERSION_CHECK_FNAME", fname):
+                with patch("aider.versioncheck.fetch_latest_version") as mock_fetch:
+                    self.assertEqual(versioncheck.get_latest_version(), "1.2.3")
+                    mock_fetch.assert_not_called()
+
+    def test_get_latest_version_refetches_stale_cache(self):
+        with ChdirTemporaryDirectory():
+            fname = Path("version.check.json")
+            stale = time.time() - versioncheck.VERSION_CHECK_TTL - 1
+            fname.write_text(json.dumps(dict(latest="1.2.3", fetched_at=stale)))
+
+            with patch("aider.versioncheck.VERSION_CHECK_FNAME", fname):
+                with patch("aider.versioncheck.fetch_latest_version", return_value="2.0.0"):
+                    self.assertEqual(versioncheck.get_latest_version(), "2.0.0")
+
+                data = json.loads(fname.read_text())
+                self.assertEqual(data["latest"], "2.0.0")
+
+    def test_get_latest_version_writes_through_on_miss(self):
+        with ChdirTemporaryDirectory():
+            fname = Path("version.check.json")
+
+            with patch("aider.versioncheck.VERSION_CHECK_FNAME", fname):
+                with patch("aider.versioncheck.fetch_latest_version", return_value="9.9.9"):
+                    self.assertEqual(versioncheck.get_latest_version(), "9.9.9")
+
+                self.assertTrue(fname.exists())
+                data = json.loads(fname.read_text())
+                self.assertEqual(data["latest"], "9.9.9")
+
+
+if __name__ == "__main__":
+    unittest.main()